@@ -1,6 +1,6 @@
 import collections
 import copy
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from mapadroid.db.DbWrapper import DbWrapper
 from mapadroid.utils.logging import LoggerEnums, get_logger
@@ -19,7 +19,7 @@ class DataManager(object):
     def __init__(self, dbc: DbWrapper, instance_id: int):
         self.dbc = dbc
         self.instance_id = instance_id
-        self.__paused_devices: List[int] = []
+        self.__paused_devices: Set[int] = set()
 
     def clear_on_boot(self) -> None:
         # This function should handle any on-boot clearing.  It is not initiated by __init__ on the off-chance that
@@ -149,13 +149,9 @@ class DataManager(object):
 
     def set_device_state(self, device_id: int, active: int) -> None:
         if active == 1:
-            try:
-                self.__paused_devices.remove(device_id)
-            except ValueError:
-                pass
+            self.__paused_devices.discard(device_id)
         else:
-            if device_id not in self.__paused_devices:
-                self.__paused_devices.append(device_id)
+            self.__paused_devices.add(device_id)
 
     def is_device_active(self, device_id: int) -> bool:
         return device_id not in self.__paused_devices
@@ -369,11 +369,8 @@ class Resource(object):
         return []
 
     def get_resource(self, backend=False):
-        user_data = {}
-        fields = self._data['fields']
-        if not backend:
-            fields = dict(fields)
-        user_data.update(fields)
+        # Copy the fields once. Used for every resource serialized by MADEncoder so avoid the intermediate dict
+        user_data = dict(self._data['fields'])
         if 'settings' in self._data:
             settings = self._data['settings']
             if not backend:
@@ -1,5 +1,8 @@
 import json
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 
@@ -12,6 +15,126 @@ from .resource import Resource
 
 logger = get_logger(LoggerEnums.data_manager)
 
+# Parsed routefiles keyed on the routefile content itself so any edit (recalc, MADmin, API) is a cache miss and
+# nothing needs invalidating. The (N, 2) arrays are shared between callers and thus flagged read-only
+ROUTEFILE_CACHE_SIZE = 256
+_parsed_routefiles: Dict[Tuple[str, ...], np.ndarray] = {}
+_parsed_routefiles_mutex = Lock()
+
+
+# Route calculations are handed to worker processes. The solvers are pure python / python callbacks and would
+# otherwise hold the GIL for minutes, stalling every other thread (websockets, MITM receiver, ...) of MAD
+_route_calc_pool: Optional[ProcessPoolExecutor] = None
+_route_calc_pool_mutex = Lock()
+_route_calc_pool_shut_down: bool = False
+_route_calc_futures: Set[Future] = set()
+
+
+def _get_route_calc_pool() -> ProcessPoolExecutor:
+    global _route_calc_pool
+    with _route_calc_pool_mutex:
+        if _route_calc_pool_shut_down:
+            raise RuntimeError("Route calculations have been shut down")
+        if _route_calc_pool is None:
+            _route_calc_pool = ProcessPoolExecutor()
+        return _route_calc_pool
+
+
+def _discard_route_calc_pool(broken_pool: ProcessPoolExecutor) -> None:
+    global _route_calc_pool
+    with _route_calc_pool_mutex:
+        # another thread may have replaced the broken pool already
+        if _route_calc_pool is broken_pool:
+            _route_calc_pool = None
+    broken_pool.shutdown(wait=False)
+
+
+def _forget_route_calc_future(future: Future) -> None:
+    with _route_calc_pool_mutex:
+        _route_calc_futures.discard(future)
+
+
+def shutdown_route_calculations() -> None:
+    """ Cancels the queued route calculations and terminates the processes running the others
+
+    The atexit hook of concurrent.futures would otherwise keep MAD from exiting until every calculation is done
+    """
+    global _route_calc_pool_shut_down
+    with _route_calc_pool_mutex:
+        _route_calc_pool_shut_down = True
+        pool = _route_calc_pool
+        futures = list(_route_calc_futures)
+    if pool is None:
+        return
+    # the pool drops its processes on shutdown and offers no way of stopping running calls
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False)
+    for future in futures:
+        future.cancel()
+    for process in processes:
+        process.terminate()
+
+
+def _calculate_route(coords: np.ndarray, route_name: str, num_processes: int, algorithm: str,
+                     in_memory: bool = False) -> List[int]:
+    from mapadroid.route.routecalc.calculate_route_all import route_calc_all
+    if in_memory:
+        # The leveling subroutes are small and the worker of a device waits on them, they must not queue behind the
+        # recalculations of saved routes
+        return route_calc_all(coords, route_name, num_processes, algorithm, in_memory)
+    for _ in range(2):
+        pool = _get_route_calc_pool()
+        try:
+            future = pool.submit(route_calc_all, coords, route_name, num_processes, algorithm, in_memory)
+            with _route_calc_pool_mutex:
+                _route_calc_futures.add(future)
+            future.add_done_callback(_forget_route_calc_future)
+            return future.result()
+        except BrokenProcessPool:
+            if _route_calc_pool_shut_down:
+                raise
+            # A worker process died (OOM, segfault, ...) which renders the pool unusable for good. Start over with a
+            # new one
+            logger.warning("Route calculation process of {} died, restarting the pool of route calculations",
+                           route_name)
+            _discard_route_calc_pool(pool)
+    logger.warning("Route calculation of {} failed in a new process again, calculating it in this one", route_name)
+    return route_calc_all(coords, route_name, num_processes, algorithm, in_memory)
+
+
+def _remember_parsed_routefile(routefile: Tuple[str, ...], parsed: np.ndarray) -> None:
+    parsed.setflags(write=False)
+    with _parsed_routefiles_mutex:
+        _parsed_routefiles.pop(routefile, None)
+        _parsed_routefiles[routefile] = parsed
+        while len(_parsed_routefiles) > ROUTEFILE_CACHE_SIZE:
+            del _parsed_routefiles[next(iter(_parsed_routefiles))]
+
+
+def _parse_routefile(routefile: Tuple[str, ...]) -> np.ndarray:
+    with _parsed_routefiles_mutex:
+        parsed = _parsed_routefiles.pop(routefile, None)
+        if parsed is not None:
+            # move it to the end, the least recently used routefiles are dropped first
+            _parsed_routefiles[routefile] = parsed
+            return parsed
+    lines = [line for line in routefile if line.strip()]
+    # Let numpy's C parser handle all the floats in one go. It silently stops at anything it cannot parse, in which
+    # case the line by line parsing below takes over to raise on the offending line
+    values = np.empty(0)
+    if lines and all(line.count(',') == 1 for line in lines):
+        values = np.fromstring(','.join(lines), dtype=np.float64, sep=',')
+    if values.size == 2 * len(lines):
+        parsed = values.reshape(-1, 2)
+    else:
+        result = []
+        for line in lines:
+            line_split = line.split(',')
+            result.append((float(line_split[0].strip()), float(line_split[1].strip())))
+        parsed = np.array(result, dtype=np.float64).reshape(-1, 2)
+    _remember_parsed_routefile(routefile, parsed)
+    return parsed
+
 
 class RouteCalc(Resource):
     table = 'settings_routecalc'
@@ -109,33 +232,46 @@ class RouteCalc(Resource):
 
     def calculate_new_route(self, coords: List[Tuple[str, str]], max_radius: int, max_coords_within_radius: int,
                             delete_old_route: bool, calc_type: str, use_s2: bool, s2_level: int, num_procs: int = 0,
-                            overwrite_calculation: bool = False, in_memory: bool = False, route_name: str = 'Unknown'
-                            ) -> List[Dict[str, float]]:
+                            overwrite_calculation: bool = False, in_memory: bool = False, route_name: str = 'Unknown',
+                            return_format: str = 'dicts') -> Union[List[Dict[str, float]], np.ndarray]:
         if overwrite_calculation:
             calc_type = 'route'
         self.set_recalc_status(True)
         if in_memory is False:
             if delete_old_route:
+                # Only drop it locally so get_json_route does not reuse it. The new route is saved once calculated
                 logger.debug("Deleting routefile...")
                 self._data['fields']['routefile'] = []
-                self.save()
-        new_route = self.get_json_route(coords, max_radius, max_coords_within_radius, in_memory,
-                                        num_processes=num_procs,
-                                        algorithm=calc_type, use_s2=use_s2, s2_level=s2_level,
-                                        route_name=route_name)
-        self.set_recalc_status(False)
-        return new_route
+        try:
+            return self.get_json_route(coords, max_radius, max_coords_within_radius, in_memory,
+                                       num_processes=num_procs,
+                                       algorithm=calc_type, use_s2=use_s2, s2_level=s2_level,
+                                       route_name=route_name, return_format=return_format)
+        except Exception as e:
+            logger.opt(exception=True).error("Calculating the route of {} failed: {}", route_name, e)
+            raise
+        finally:
+            self.set_recalc_status(False)
 
     def get_json_route(self, coords: List[Tuple[str, str]], max_radius: int, max_coords_within_radius: int,
                        in_memory: bool, num_processes: int = 1, algorithm: str = 'route', use_s2: bool = False,
-                       s2_level: int = 15, route_name: str = 'Unknown') -> List[Dict[str, float]]:
+                       s2_level: int = 15, route_name: str = 'Unknown', return_format: str = 'dicts'
+                       ) -> Union[List[Dict[str, float]], np.ndarray]:
+        """ Calculate (or load) the route through the given coords
+
+        return_format 'dicts' returns a list of {'lat', 'lng'} dicts as used by the API, 'ndarray' returns the route as
+        a (N, 2) float64 array and skips building the dicts entirely for routes calculated in memory. Arrays of routes
+        loaded from the routefile are shared with other callers and read-only
+        """
         if not in_memory:
-            saved_route = self.get_saved_json_route()
+            saved_route = self.__get_saved_route()
             if len(saved_route) > 0:
                 logger.debug('Using routefile from DB')
-                return saved_route
+                if return_format == 'ndarray':
+                    # shared with the cache of parsed routefiles and thus read-only
+                    return saved_route
+                return self.__to_dicts(saved_route)
 
-        export_data = []
         if use_s2:
             logger.debug("Using S2 method for calculation with S2 level: {}", s2_level)
 
@@ -143,25 +279,18 @@ class RouteCalc(Resource):
         if len(coords) > 0 and max_radius and max_coords_within_radius:
             logger.info("Calculating route for {}", route_name)
             new_coords = self.get_less_coords(coords, max_radius, max_coords_within_radius, use_s2, s2_level)
-            less_coords = np.zeros(shape=(len(new_coords), 2))
-            for i in range(len(less_coords)):
-                less_coords[i][0] = new_coords[i][0]
-                less_coords[i][1] = new_coords[i][1]
+            # Location is a namedtuple, numpy unpacks it into (lat, lng) rows directly
+            less_coords = np.asarray(new_coords, dtype=np.float64).reshape(-1, 2)
             logger.debug("Coords summed up: {}, that's just {} coords", less_coords, len(less_coords))
         logger.debug("Got {} coordinates", len(less_coords))
         if len(less_coords) < 3:
             logger.debug("less than 3 coordinates... not gonna take a shortest route on that")
-            export_data = []
-            for i in range(len(less_coords)):
-                export_data.append({'lat': less_coords[i][0].item(),
-                                    'lng': less_coords[i][1].item()})
+            route_coords = np.asarray(less_coords, dtype=np.float64).reshape(-1, 2)
         else:
             logger.info("Calculating a short route through all those coords. Might take a while")
             from timeit import default_timer as timer
             start = timer()
-            from mapadroid.route.routecalc.calculate_route_all import \
-                route_calc_all
-            sol_best = route_calc_all(less_coords, route_name, num_processes, algorithm)
+            sol_best = _calculate_route(less_coords, route_name, num_processes, algorithm, in_memory=in_memory)
 
             end = timer()
 
@@ -173,17 +302,21 @@ class RouteCalc(Resource):
 
             logger.info("Calculated route for {} in {} {}", route_name, calc_dur, time_unit)
 
-            for i in range(len(sol_best)):
-                export_data.append({'lat': less_coords[int(sol_best[i])][0].item(),
-                                    'lng': less_coords[int(sol_best[i])][1].item()})
+            route_order = np.asarray(sol_best, dtype=np.intp)
+            route_coords = np.asarray(less_coords, dtype=np.float64)[route_order]
+        if in_memory and return_format == 'ndarray':
+            return route_coords
+        export_data = [{'lat': lat, 'lng': lng} for lat, lng in route_coords.tolist()]
         if not in_memory:
-            calc_coords = []
-            for coord in export_data:
-                calc_coord = '%s,%s' % (coord['lat'], coord['lng'])
-                calc_coords.append(calc_coord)
+            calc_coords = ['%s,%s' % (coord['lat'], coord['lng']) for coord in export_data]
+            # The floats are formatted with repr so they survive the round-trip unchanged. Seed the cache with what
+            # we already have instead of parsing the strings back on the next read of the routefile
+            _remember_parsed_routefile(tuple(calc_coords), route_coords.copy())
             # Only save if we aren't calculating in memory
             self._data['fields']['routefile'] = calc_coords
             self.save(update_time=True)
+        if return_format == 'ndarray':
+            return route_coords
         return export_data
 
     def get_less_coords(self, np_coords: List[Tuple[str, str]], max_radius: int, max_coords_within_radius: int,
@@ -211,13 +344,15 @@ class RouteCalc(Resource):
         }
         self._dbc.autoexec_update(self.table, data, where_keyvals=where)
 
-    def get_saved_json_route(self):
-        result = []
+    def get_saved_json_route(self) -> List[Dict[str, float]]:
+        return self.__to_dicts(self.__get_saved_route())
+
+    def __get_saved_route(self) -> np.ndarray:
         routefile = self._data['fields']['routefile']
-        if routefile is not None:
-            for line in routefile:
-                if not line.strip():
-                    continue
-                line_split = line.split(',')
-                result.append({'lat': float(line_split[0].strip()), 'lng': float(line_split[1].strip())})
-        return result
+        if routefile is None:
+            return np.empty(shape=(0, 2))
+        return _parse_routefile(tuple(routefile))
+
+    @staticmethod
+    def __to_dicts(route: np.ndarray) -> List[Dict[str, float]]:
+        return [{'lat': lat, 'lng': lng} for lat, lng in route.tolist()]
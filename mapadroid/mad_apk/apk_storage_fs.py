@@ -9,7 +9,7 @@ from typing import Any, ClassVar, NamedTuple, NoReturn, Optional
 
 from flask import Response
 
-from mapadroid.utils.json_encoder import MADEncoder
+from mapadroid.utils import json_encoder
 from mapadroid.utils.logging import LoggerEnums, get_logger
 
 from .abstract_apk_storage import AbstractAPKStorage
@@ -216,7 +216,7 @@ class APKStorageFilesystem(AbstractAPKStorage):
         "Save the current configuration to the filesystem with human-readable indentation"
         with self.file_lock:
             with open(self.config_filepath, 'w+') as fh:
-                json.dump(self.apks, fh, indent=2, cls=MADEncoder)
+                fh.write(json_encoder.dumps(self.apks, indent=2))
 
     @ensure_config_file
     def shutdown(self) -> NoReturn:
@@ -1,8 +1,6 @@
-import json
-
 import flask
 
-from mapadroid.utils.json_encoder import MADEncoder
+from mapadroid.utils import json_encoder
 
 from . import apiException
 
@@ -35,6 +33,6 @@ class APIResponse(object):
                 indent = None
                 if beautify and beautify.isdigit() and int(beautify) == 1:
                     indent = 4
-                return json.dumps(content, indent=indent, cls=MADEncoder)
+                return json_encoder.dumps(content, indent=indent)
             except Exception as err:
                 raise apiException.FormattingError(500, err)
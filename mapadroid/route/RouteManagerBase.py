@@ -272,7 +272,7 @@ class RouteManagerBase(ABC):
         self.add_coords_numpy(to_be_appended)
 
     def calculate_new_route(self, coords, max_radius, max_coords_within_radius, delete_old_route, num_procs=0,
-                            in_memory=False, calctype=None):
+                            in_memory=False, calctype=None, return_format='dicts'):
         if calctype is None:
             calctype = self._calctype
         if len(coords) > 0:
@@ -281,10 +281,13 @@ class RouteManagerBase(ABC):
                                                                  self.S2level,
                                                                  num_procs=0,
                                                                  overwrite_calculation=self._overwrite_calculation,
-                                                                 in_memory=in_memory, route_name=self.name)
+                                                                 in_memory=in_memory, route_name=self.name,
+                                                                 return_format=return_format)
             if self._overwrite_calculation:
                 self._overwrite_calculation = False
             return new_route
+        if return_format == 'ndarray':
+            return np.empty(shape=(0, 2))
         return []
 
     def initial_calculation(self, max_radius: float, max_coords_within_radius: int, num_procs: int = 1,
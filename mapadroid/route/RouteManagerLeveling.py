@@ -57,8 +57,8 @@ class RouteManagerLeveling(RouteManagerQuests):
                 if len(origin_local_list) == 0:
                     self.logger.info("None of the stops in original route was unvisited, recalc a route")
                     new_route = self._local_recalc_subroute(unvisited_stops)
-                    for coord in new_route:
-                        origin_local_list.append(Location(coord["lat"], coord["lng"]))
+                    for lat, lng in new_route.tolist():
+                        origin_local_list.append(Location(lat, lng))
 
                 # subroute is all stops unvisited
                 self.logger.info("Origin {} has {} unvisited stops for this route", origin, len(origin_local_list))
@@ -76,7 +76,7 @@ class RouteManagerLeveling(RouteManagerQuests):
             to_be_route[i][1] = float(unvisited_stops[i].lng)
         new_route = self.calculate_new_route(to_be_route, self._max_radius, self._max_coords_within_radius,
                                              False, 1,
-                                             True)
+                                             True, return_format='ndarray')
 
         return new_route
 
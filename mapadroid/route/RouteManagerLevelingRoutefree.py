@@ -64,8 +64,8 @@ class RouteManagerLevelingRoutefree(RouteManagerQuests):
                     self.logger.info("Recalc a route")
                     new_route = self._local_recalc_subroute(unvisited_stops)
                     origin_local_list.clear()
-                    for coord in new_route:
-                        origin_local_list.append(Location(coord["lat"], coord["lng"]))
+                    for lat, lng in new_route.tolist():
+                        origin_local_list.append(Location(lat, lng))
 
                 # subroute is all stops unvisited
                 self.logger.info("Origin {} has {} unvisited stops for this route", origin, len(origin_local_list))
@@ -88,7 +88,7 @@ class RouteManagerLevelingRoutefree(RouteManagerQuests):
             to_be_route[i][1] = float(unvisited_stops[i].lng)
         new_route = self.calculate_new_route(to_be_route, self._max_radius, self._max_coords_within_radius,
                                              False, 1,
-                                             True)
+                                             True, return_format='ndarray')
 
         return new_route
 
@@ -1,10 +1,15 @@
+import numpy as np
 import s2sphere
 
 from mapadroid.utils.collections import Relation
 from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
+                                 get_distances_in_meters,
                                  get_middle_of_coord_list)
 from mapadroid.utils.s2Helper import S2Helper
 
+# rows of distances computed at once while looking for relations, bounds the memory to a few MB per clustering
+DISTANCE_ROWS_PER_CHUNK = 64
+
 
 class ClusteringHelper:
     def __init__(self, max_radius, max_count_per_circle, max_timedelta_seconds, use_s2: bool = False,
@@ -17,27 +22,33 @@ class ClusteringHelper:
 
     def _get_relations_in_range_within_time(self, queue, max_radius):
         relations = {}
-        for event in queue:
-            for other_event in queue:
-                if event[1].lat == other_event[1].lat and event[1].lng == other_event[1].lng and \
-                   event not in relations.keys():
+        if not queue:
+            return relations
+        # compute the distances on plain lat/lng arrays, a few rows at a time so that the N x N matrix is never held
+        lats = np.fromiter((event[1].lat for event in queue), dtype=np.float64, count=len(queue))
+        lngs = np.fromiter((event[1].lng for event in queue), dtype=np.float64, count=len(queue))
+        for chunk_start in range(0, len(queue), DISTANCE_ROWS_PER_CHUNK):
+            chunk_end = chunk_start + DISTANCE_ROWS_PER_CHUNK
+            distances = get_distances_in_meters(lats[chunk_start:chunk_end], lngs[chunk_start:chunk_end], lats, lngs)
+            for event, event_distances in zip(queue[chunk_start:chunk_end], distances):
+                # every event is in range of itself and thus related to at least its own coords
+                if event not in relations:
                     relations[event] = []
-                distance = get_distance_of_two_points_in_meters(event[1].lat, event[1].lng,
-                                                                other_event[1].lat, other_event[1].lng)
-                # we will always build relations from the event at hand subtracted by the event inspected
-                timedelta = event[0] - other_event[0]
-                if 0 <= distance <= max_radius * 2 and 0 <= timedelta <= self.max_timedelta_seconds:
-                    if event not in relations.keys():
-                        relations[event] = []
+                related_coords = None
+                for other_index in np.flatnonzero(event_distances <= max_radius * 2).tolist():
+                    other_event = queue[other_index]
+                    # we will always build relations from the event at hand subtracted by the event inspected
+                    timedelta = event[0] - other_event[0]
+                    if not 0 <= timedelta <= self.max_timedelta_seconds:
+                        continue
                     # avoid duplicates
-                    already_present = False
-                    for relation in relations[event]:
-                        if relation[0][1].lat == other_event[1].lat and \
-                           relation[0][1].lng == other_event[1].lng:
-                            already_present = True
-                    if not already_present:
+                    if related_coords is None:
+                        related_coords = {(relation[0][1].lat, relation[0][1].lng) for relation in relations[event]}
+                    other_coords = (other_event[1].lat, other_event[1].lng)
+                    if other_coords not in related_coords:
+                        related_coords.add(other_coords)
                         relations[event].append(
-                            Relation(other_event, distance, timedelta))
+                            Relation(other_event, float(event_distances[other_index]), timedelta))
         return relations
 
     def _get_most_west_amongst_relations(self, relations):
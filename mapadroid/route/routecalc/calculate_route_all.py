@@ -1,5 +1,6 @@
-import math
+import numpy as np
 
+from mapadroid.utils.geo import get_distance_matrix_in_meters
 from mapadroid.utils.logging import get_origin_logger, logger
 
 try:
@@ -7,39 +8,23 @@ try:
 except Exception:
     pass
 
+# Guided local search keeps improving the first solution until stopped, bound the time spent per route. It is only
+# used for routes that are saved, in memory routes are recalculated on the worker thread waiting for them
+ORTOOLS_TIME_LIMIT_SECONDS = 30
 
-def create_data_model(less_coordinates):
+
+def create_data_model(distance_matrix):
     """Stores the data for the problem."""
 
     data = {}
 
-    # ortools requires x,y data to be integers
-    # we will scale lat,lng to large numbers so that rounding won't adversely affect the path calculation
-    data['locations'] = []
-    for coord in less_coordinates:
-        data['locations'].append((int(float(coord[0]) * 1e9), int(float(coord[1]) * 1e9)))
-
+    # ortools requires the distances to be integers which route_calc_all already quantized them to
+    data['distance_matrix'] = distance_matrix.tolist()
     data['num_vehicles'] = 1  # calculate as if only one walker on route
     data['depot'] = 0  # route will start at the first lat,lng
     return data
 
 
-def compute_euclidean_distance_matrix(locations):
-    """Creates callback to return distance between points."""
-    distances = {}
-    for from_counter, from_node in enumerate(locations):
-        distances[from_counter] = {}
-        for to_counter, to_node in enumerate(locations):
-            if from_counter == to_counter:
-                distances[from_counter][to_counter] = 0
-            else:
-                # Euclidean distance
-                distances[from_counter][to_counter] = (int(
-                    math.hypot((from_node[0] - to_node[0]),
-                               (from_node[1] - to_node[1]))))
-    return distances
-
-
 def format_solution(manager, routing, solution):
     """Format the solution for MAD."""
     route_through_nodes = []
@@ -50,19 +35,18 @@ def format_solution(manager, routing, solution):
     return route_through_nodes
 
 
-def route_calc_ortools(less_coordinates, route_name):
+def route_calc_ortools(distance_matrix, route_name, improve_solution: bool = True):
     route_logger = get_origin_logger(logger, origin=route_name)
-    data = create_data_model(less_coordinates)
+    data = create_data_model(distance_matrix)
+    distance_matrix = data['distance_matrix']
 
     # Create the routing index manager.
-    manager = pywrapcp.RoutingIndexManager(len(data['locations']),
+    manager = pywrapcp.RoutingIndexManager(len(distance_matrix),
                                            data['num_vehicles'], data['depot'])
 
     # Create Routing Model.
     routing = pywrapcp.RoutingModel(manager)
 
-    distance_matrix = compute_euclidean_distance_matrix(data['locations'])
-
     def distance_callback(from_index, to_index):
         """Returns the distance between the two nodes."""
         # Convert from routing variable Index to distance matrix NodeIndex.
@@ -70,7 +54,11 @@ def route_calc_ortools(less_coordinates, route_name):
         to_node = manager.IndexToNode(to_index)
         return distance_matrix[from_node][to_node]
 
-    transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+    if hasattr(routing, 'RegisterTransitMatrix'):
+        # Newer OR-Tools keep the matrix on the C++ side and never call back into python while solving
+        transit_callback_index = routing.RegisterTransitMatrix(distance_matrix)
+    else:
+        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
 
     # Define cost of each arc.
     routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
@@ -78,17 +66,29 @@ def route_calc_ortools(less_coordinates, route_name):
     # Setting first solution heuristic.
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
     search_parameters.first_solution_strategy = (routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC)
+    if improve_solution:
+        # Improve upon the first solution instead of walking the greedy path
+        search_parameters.local_search_metaheuristic = (
+            routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH)
+        search_parameters.time_limit.seconds = ORTOOLS_TIME_LIMIT_SECONDS
 
     # Solve the problem.
     route_logger.debug("OR-Tools routecalc starting for route: {}", route_name)
     solution = routing.SolveWithParameters(search_parameters)
     route_logger.debug("OR-Tools routecalc finished for route: {}", route_name)
+    if solution is None:
+        return None
 
     return format_solution(manager, routing, solution)
 
 
-def route_calc_all(less_coordinates, route_name, num_processes, algorithm):
+def route_calc_all(less_coordinates, route_name, num_processes, algorithm, in_memory: bool = False):
     route_logger = get_origin_logger(logger, origin=route_name)
+    less_coordinates = np.asarray(less_coordinates, dtype=np.float64)
+    # Both solvers look up distances over and over, calculate all of them once. OR-Tools requires integer distances
+    # and the solvers only compare and sum them, so they are rounded to whole meters
+    distance_matrix = np.rint(get_distance_matrix_in_meters(less_coordinates[:, 0], less_coordinates[:, 1]))
+    distance_matrix = distance_matrix.astype(np.int64)
     # check to see if we can use OR-Tools to perform our routecalc
     import platform
     if platform.architecture()[0] == "64bit" and algorithm == 'route':  # OR-Tools is only available for 64bit python
@@ -100,8 +100,11 @@ def route_calc_all(less_coordinates, route_name, num_processes, algorithm):
             route_logger.debug("OR-Tools not available, using MAD routecalc")
         else:
             route_logger.debug("Using OR-Tools for routecalc")
-            return route_calc_ortools(less_coordinates, route_name)
+            solution = route_calc_ortools(distance_matrix, route_name, improve_solution=not in_memory)
+            if solution is not None:
+                return solution
+            route_logger.warning("OR-Tools did not find a solution, using MAD routecalc")
 
     route_logger.debug("Using MAD quick routecalc")
     from mapadroid.route.routecalc.calculate_route_quick import route_calc_impl
-    return route_calc_impl(less_coordinates, route_name, num_processes)
+    return route_calc_impl(distance_matrix, route_name, num_processes)
@@ -3,22 +3,18 @@ from mapadroid.utils.logging import LoggerEnums, get_logger
 logger = get_logger(LoggerEnums.routemanager)
 
 
-def route_calc_impl(coords, route_name, num_processes=1):
+def route_calc_impl(distance_matrix, route_name, num_processes=1):
     with logger.contextualize(origin=route_name):
-        less_coords_array = []
-        for i in range(len(coords)):
-            less_coords_array.append([coords[i][0].item(), coords[i][1].item()])
-
-        length, path = tsp(less_coords_array)
+        length, path = tsp(distance_matrix)
         logger.info("Found {} long solution: ", length)
 
     return path
 
 
-def tsp(data):
-    logger.info("building the graph for a route of {}", len(data))
+def tsp(distance_matrix):
+    logger.info("building the graph for a route of {}", len(distance_matrix))
     # build a graph
-    graph_data = build_graph(data)
+    graph_data = build_graph(distance_matrix)
 
     # build a minimum spanning tree
     logger.info("Building a min span tree..")
@@ -56,20 +52,11 @@ def tsp(data):
     return length, path
 
 
-def get_length(x1, y1, x2, y2):
-    return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** (1 / 2)
-
-
-def build_graph(data):
+def build_graph(distance_matrix):
     graph = {}
-    for this in range(len(data)):
-        for another_point in range(len(data)):
-            if this != another_point:
-                if this not in graph:
-                    graph[this] = {}
-
-                graph[this][another_point] = get_length(data[this][0], data[this][1], data[another_point][0],
-                                                        data[another_point][1])
+    for this, distances in enumerate(distance_matrix.tolist()):
+        graph[this] = {another_point: distance for another_point, distance in enumerate(distances)
+                       if this != another_point}
 
     return graph
 
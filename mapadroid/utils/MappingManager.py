@@ -5,12 +5,15 @@ from multiprocessing.managers import SyncManager
 from multiprocessing.pool import ThreadPool
 from queue import Empty, Queue
 from threading import Thread
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
+from mapadroid.data_manager.modules.routecalc import \
+    shutdown_route_calculations
 from mapadroid.db.DbWrapper import DbWrapper
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
 from mapadroid.route import RouteManagerBase, RouteManagerIV
 from mapadroid.route.RouteManagerFactory import RouteManagerFactory
+from mapadroid.utils.authHelper import get_auth_headers
 from mapadroid.utils.collections import Location
 from mapadroid.utils.language import get_mon_ids
 from mapadroid.utils.logging import LoggerEnums, get_logger
@@ -90,6 +93,7 @@ class MappingManager:
         self._areas: Optional[dict] = None
         self._routemanagers: Optional[Dict[str, dict]] = None
         self._auths: Optional[dict] = None
+        self._auth_headers: Optional[FrozenSet[str]] = None
         self.__areamons: Optional[Dict[int, list[int]]] = {}
         self._monlists: Optional[dict] = None
         self.__shutdown_event: Event = Event()
@@ -106,13 +110,25 @@ class MappingManager:
 
     def shutdown(self):
         logger.fatal("MappingManager exiting")
+        # the route managers calculate their routes within this process
+        shutdown_route_calculations()
 
     def get_auths(self) -> Optional[dict]:
         return self._auths
 
+    def get_auth_headers(self) -> Optional[FrozenSet[str]]:
+        return self._auth_headers
+
     def get_devicemappings_of(self, device_name: str) -> Optional[dict]:
         return self._devicemappings.get(device_name, None)
 
+    def has_devicemapping(self, device_name: str) -> bool:
+        return device_name in self._devicemappings
+
+    def get_device_id_of(self, device_name: str) -> Optional[int]:
+        devicemapping: Optional[dict] = self._devicemappings.get(device_name, None)
+        return devicemapping.get('device_id', None) if devicemapping is not None else None
+
     def get_devicesettings_of(self, device_name: str) -> Optional[dict]:
         return self._devicemappings.get(device_name, None).get('settings', None)
 
@@ -649,6 +665,7 @@ class MappingManager:
                 self._devicemappings = devicemappings_tmp
                 self._routemanagers = routemanagers_tmp
                 self._auths = auths_tmp
+                self._auth_headers = get_auth_headers(auths_tmp)
 
         else:
             logger.debug("Acquiring lock to update mappings,full")
@@ -659,6 +676,7 @@ class MappingManager:
                 self._routemanagers = self.__get_latest_routemanagers()
                 self._devicemappings = self.__get_latest_devicemappings()
                 self._auths = self.__get_latest_auths()
+                self._auth_headers = get_auth_headers(self._auths)
 
         logger.info("Mappings have been updated")
 
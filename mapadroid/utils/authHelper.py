@@ -1,5 +1,18 @@
 import base64
 import re
+from typing import FrozenSet, Optional
+
+
+def get_auth_headers(auths) -> Optional[FrozenSet[str]]:
+    """
+    Builds the Authorization headers matching the configured auths
+    :param auths: Dict of username : password
+    :return: frozenset of "Basic <base64 of username:password>" or None if no auths are configured
+    """
+    if auths is None:
+        return None
+    return frozenset('Basic ' + base64.b64encode(('%s:%s' % (username, password)).encode('utf-8')).decode('utf-8')
+                     for username, password in auths.items())
 
 
 def check_auth(logger, auth_header, args, auths):
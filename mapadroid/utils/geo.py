@@ -1,7 +1,56 @@
 import math
 
+import numpy as np
+
 from mapadroid.utils.collections import Location
 
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+# approximate radius of earth in meters, identical to get_distance_of_two_points_in_meters
+EARTH_RADIUS_METERS = 6373.0 * 1000
+
+
+def get_distances_in_meters(lats, lngs, other_lats, other_lngs):
+    """ Distances of every point given by lats/lngs (rows) to every other point (columns) """
+    lat_rad = np.radians(lats)[:, None]
+    lng_rad = np.radians(lngs)[:, None]
+    other_lat_rad = np.radians(other_lats)[None, :]
+    other_lng_rad = np.radians(other_lngs)[None, :]
+    angle = np.sin((other_lat_rad - lat_rad) / 2) ** 2 + \
+        np.cos(lat_rad) * np.cos(other_lat_rad) * np.sin((other_lng_rad - lng_rad) / 2) ** 2
+    return EARTH_RADIUS_METERS * 2 * np.arctan2(np.sqrt(angle), np.sqrt(1 - angle))
+
+
+def _distance_matrix_in_meters_numpy(lats, lngs):
+    return get_distances_in_meters(lats, lngs, lats, lngs)
+
+
+def _distance_matrix_in_meters_kernel(lats, lngs):
+    amount = lats.shape[0]
+    lat_rad = np.radians(lats)
+    lng_rad = np.radians(lngs)
+    cos_lat = np.cos(lat_rad)
+    distances = np.empty((amount, amount), dtype=np.float64)
+    for i in range(amount):
+        for j in range(amount):
+            sin_dlat = math.sin((lat_rad[j] - lat_rad[i]) / 2)
+            sin_dlng = math.sin((lng_rad[j] - lng_rad[i]) / 2)
+            angle = sin_dlat * sin_dlat + cos_lat[i] * cos_lat[j] * sin_dlng * sin_dlng
+            distances[i, j] = EARTH_RADIUS_METERS * 2 * math.atan2(math.sqrt(angle), math.sqrt(1 - angle))
+    return distances
+
+
+if njit is not None:
+    # No parallel=True: the clustering runs on a thread pool of MappingManager and route calculations fork processes.
+    # Numba's workqueue threading layer aborts on concurrent use and its OpenMP layer is not fork-safe.
+    # Releasing the GIL lets the calls of those threads run side by side instead
+    get_distance_matrix_in_meters = njit(nogil=True, cache=True)(_distance_matrix_in_meters_kernel)
+else:
+    get_distance_matrix_in_meters = _distance_matrix_in_meters_numpy
+
 
 def get_lat_lng_offsets_by_distance(distance):
     earth = 6373.0
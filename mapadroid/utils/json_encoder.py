@@ -1,34 +1,74 @@
 import json
+from enum import Enum
+from typing import Any, Optional
 
 from mapadroid.data_manager.modules.resource import Resource
-from mapadroid.mad_apk.apk_enums import APKArch, APKType
 from mapadroid.mad_apk.custom_types import MADapks, MADPackage, MADPackages
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def mad_default(obj):
+    """ Converts MAD specific objects into something serializable. Raises TypeError for anything unknown """
+    # Ordered by how often the types are seen. Enum also covers APKArch / APKType
+    if isinstance(obj, Enum):
+        return obj._value_
+    elif isinstance(obj, Resource):
+        return obj.get_resource()
+    elif isinstance(obj, MADPackage):
+        return obj.get_package(backend=False)
+    elif isinstance(obj, (MADapks, MADPackages)):
+        return {str(obj_key.name): key_value for obj_key, key_value in obj.items()}
+    # orjson hands over every subclass of a builtin type (OPT_PASSTHROUGH_SUBCLASS), not only the MAD ones. Anything
+    # else (OrderedDict, defaultdict, numpy.float64, ...) is written as its builtin type, just like the stdlib does
+    elif isinstance(obj, dict):
+        return dict(obj)
+    elif isinstance(obj, (list, tuple)):
+        return list(obj)
+    elif isinstance(obj, str):
+        return str(obj)
+    elif isinstance(obj, int):
+        return int(obj)
+    elif isinstance(obj, float):
+        return float(obj)
+    raise TypeError('Object of type %s is not JSON serializable' % (obj.__class__.__name__,))
+
+
+def _apk_encode(object_to_encode):
+    if isinstance(object_to_encode, (MADapks, MADPackages)):
+        return {str(obj_key.name): _apk_encode(key_value) for obj_key, key_value in object_to_encode.items()}
+    return object_to_encode
 
-class MADEncoder(json.JSONEncoder):
-    def apk_encode(self, object_to_encode):
-        if isinstance(object_to_encode, MADapks) or isinstance(object_to_encode, MADPackages):
-            updated = {}
-            for obj_key, key_value in object_to_encode.items():
-                updated[str(obj_key.name)] = self.apk_encode(key_value)
-            object_to_encode = updated
-        return object_to_encode
 
+class MADEncoder(json.JSONEncoder):
     def encode(self, object_to_encode, *args, **kw):
-        for_json = object_to_encode
-        if isinstance(object_to_encode, MADapks) or isinstance(object_to_encode, MADPackages):
-            for_json = self.apk_encode(object_to_encode)
-        return super(MADEncoder, self).encode(for_json, *args, **kw)
+        # The stdlib encoder writes dict subclasses itself without ever calling default(), so MADapks / MADPackages
+        # need their enum keys renamed before handing off
+        if isinstance(object_to_encode, (MADapks, MADPackages)):
+            object_to_encode = _apk_encode(object_to_encode)
+        return super(MADEncoder, self).encode(object_to_encode, *args, **kw)
 
     def default(self, obj):
-        if isinstance(obj, MADPackage):
-            return obj.get_package(backend=False)
-        elif isinstance(obj, APKArch):
-            return obj.value
-        elif isinstance(obj, APKType):
-            return obj.value
-        elif isinstance(obj, Resource):
-            return obj.get_resource()
-        elif isinstance(obj, MADapks):
-            return json.JSONEncoder.default(self, obj)
-        return json.JSONEncoder.default(self, obj)
+        return mad_default(obj)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """ Serialize obj to a JSON string using orjson if it is installed, otherwise the stdlib with MADEncoder
+
+    orjson only supports an indentation of two spaces so any other indentation is handled by the stdlib
+    """
+    if orjson is not None and indent in (None, 2):
+        # MADapks / MADPackages are dict subclasses and need to pass through to mad_default to get their keys renamed.
+        # Resources are keyed by their integer identifiers which the stdlib silently converts to strings
+        option = orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=mad_default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # orjson is stricter than the stdlib, e.g. on integers exceeding 64 bits
+            pass
+    return json.dumps(obj, indent=indent, cls=MADEncoder)
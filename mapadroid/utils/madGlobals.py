@@ -1,6 +1,8 @@
 from enum import Enum
-from multiprocessing import Event
+from threading import Event
 
+# Only ever checked by threads of the main process. A threading.Event avoids the semaphore round-trip a
+# multiprocessing.Event does on every is_set()
 terminate_mad = Event()
 
 
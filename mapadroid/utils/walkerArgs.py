@@ -62,6 +62,9 @@ def parse_args():
                         help='Port of the websocket to listen on. Default: 8080')
     parser.add_argument('-wsct', '--websocket_command_timeout', required=False, type=int, default=30,
                         help='The max time to wait for a command to return (in seconds). Default: 30 seconds')
+    parser.add_argument('-wswps', '--ws_worker_pool_size', required=False, type=int, default=50,
+                        help='Number of threads kept for running the workers of connected devices. Devices '
+                             'connecting beyond that get a thread of their own. Default: 50')
 
     # MITM Receiver (PD receiver)
     parser.add_argument('-mrip', '--mitmreceiver_ip', required=False, default="0.0.0.0", type=str,
@@ -1,7 +1,6 @@
 import asyncio
 import math
 import time
-from threading import Thread
 from typing import Dict, Optional
 
 import websockets
@@ -11,6 +10,7 @@ from mapadroid.utils.logging import LoggerEnums, get_logger, get_origin_logger
 from mapadroid.utils.madGlobals import (
     WebsocketWorkerConnectionClosedException, WebsocketWorkerRemovedException,
     WebsocketWorkerTimeoutException)
+from mapadroid.websocket.WorkerThreadPool import PooledWorkerThread
 from mapadroid.worker.AbstractWorker import AbstractWorker
 
 
@@ -22,11 +22,12 @@ class ReceivedMessageEntry:
 
 
 class WebsocketConnectedClientEntry:
-    def __init__(self, origin: str, worker_thread: Optional[Thread], worker_instance: Optional[AbstractWorker],
+    def __init__(self, origin: str, worker_thread: Optional[PooledWorkerThread],
+                 worker_instance: Optional[AbstractWorker],
                  websocket_client_connection: Optional[websockets.WebSocketClientProtocol],
                  loop_running: asyncio.AbstractEventLoop):
         self.origin: str = origin
-        self.worker_thread: Optional[Thread] = worker_thread
+        self.worker_thread: Optional[PooledWorkerThread] = worker_thread
         self.worker_instance: Optional[AbstractWorker] = worker_instance
         self.websocket_client_connection: Optional[websockets.WebSocketClientProtocol] = websocket_client_connection
         self.loop_running: asyncio.AbstractEventLoop = loop_running
@@ -35,6 +36,8 @@ class WebsocketConnectedClientEntry:
         self.received_mutex: asyncio.Lock = asyncio.Lock()
         self.message_id_counter: int = 0
         self.message_id_mutex: asyncio.Lock = asyncio.Lock()
+        # set once worker_thread has been joined, replaced along with worker_thread
+        self.stopped_event: asyncio.Event = asyncio.Event()
         self.logger = get_origin_logger(get_logger(LoggerEnums.websocket), origin=origin)
         # store a timestamp in order to cleanup (soft-states)
         self.last_message_received_at: float = 0
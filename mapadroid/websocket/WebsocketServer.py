@@ -1,11 +1,11 @@
 import asyncio
 import functools
 import logging
-import queue
 import random as rand
-import time
-from threading import Event, Thread, current_thread
-from typing import Coroutine, Dict, List, Optional, Set
+import struct
+from collections import deque
+from threading import Event, Thread, get_ident
+from typing import Coroutine, Deque, Dict, FrozenSet, List, Optional, Tuple
 
 import websockets
 
@@ -22,6 +22,8 @@ from mapadroid.websocket.AbstractCommunicator import AbstractCommunicator
 from mapadroid.websocket.communicator import Communicator
 from mapadroid.websocket.WebsocketConnectedClientEntry import \
     WebsocketConnectedClientEntry
+from mapadroid.websocket.WorkerThreadPool import (PooledWorkerThread,
+                                                  WorkerThreadPool)
 from mapadroid.worker.AbstractWorker import AbstractWorker
 from mapadroid.worker.WorkerFactory import WorkerFactory
 
@@ -34,6 +36,16 @@ logging.getLogger('websockets.protocol').addHandler(InterceptHandler(log_section
 logger = get_logger(LoggerEnums.websocket)
 
 
+@functools.lru_cache(maxsize=1024)
+def _origin_logger(origin: Optional[str]):
+    # devices keep reconnecting with the same origin, bind the logger of each origin only once
+    return get_origin_logger(logger, origin=origin)
+
+
+# binary messages start with the message ID as unsigned 32 bit big endian integer
+MESSAGE_ID_STRUCT: struct.Struct = struct.Struct('>I')
+
+
 class WebsocketServer(object):
     def __init__(self, args, mitm_mapper: MitmMapper, db_wrapper: DbWrapper, mapping_manager: MappingManager,
                  pogo_window_manager: PogoWindows, data_manager: DataManager, event, enable_configmode: bool = False):
@@ -49,11 +61,13 @@ class WebsocketServer(object):
         self.__stop_server: Event = Event()
 
         # Dict keeping currently running connections and workers for management
-        # Do think twice before plainly accessing, there's locks to be used
+        # Only to be modified from within the loop, the loop being single threaded is what keeps it consistent
         self.__current_users: Dict[str, WebsocketConnectedClientEntry] = {}
-        self.__current_users_mutex: Optional[asyncio.Lock] = None
-        self.__users_connecting: Set[str] = set()
-        self.__users_connecting_mutex: Optional[asyncio.Lock] = None
+        # Snapshot of the origins with an open connection, replaced from within the loop whenever a connection is
+        # registered or done. Being immutable, it can be read from any thread without going through the loop
+        self.__connected_origins: FrozenSet[str] = frozenset()
+        # Locks per origin serializing the connection attempts of a device, created on demand within the loop
+        self.__origin_locks: Dict[str, asyncio.Lock] = {}
 
         self.__worker_factory: WorkerFactory = WorkerFactory(self.__args, self.__mapping_manager, self.__mitm_mapper,
                                                              self.__db_wrapper, self.__pogo_window_manager, event)
@@ -61,25 +75,29 @@ class WebsocketServer(object):
         # asyncio loop for the entire server
         self.__loop: Optional[asyncio.AbstractEventLoop] = asyncio.new_event_loop()
         self.__loop_tid: int = -1
-        self.__worker_shutdown_queue: queue.Queue[Thread] = queue.Queue()
+        # threads running the workers are reused rather than spawning a new one for every connection
+        self.__worker_thread_pool: WorkerThreadPool = WorkerThreadPool(self.__args.ws_worker_pool_size)
+        # worker threads to be joined along with the event to set once they are
+        # appending to and popping from a deque is thread-safe, the event wakes up the join thread
+        self.__worker_shutdown_queue: Deque[Tuple[PooledWorkerThread, asyncio.Event]] = deque()
+        self.__worker_shutdown_queued: Event = Event()
         self.__internal_worker_join_thread: Thread = Thread(name='system',
                                                             target=self.__internal_worker_join)
         self.__internal_worker_join_thread.daemon = True
 
     def _add_task_to_loop(self, coro: Coroutine):
-        create_task = functools.partial(self.__loop.create_task, coro)
-        if current_thread() == self.__loop_tid:
+        if get_ident() == self.__loop_tid:
             # We can call directly if we're not going between threads.
-            return create_task()
+            return self.__loop.create_task(coro)
         else:
             # We're in a non-event loop thread so we use a Future
             # to get the task from the event loop thread once
             # it's ready.
-            return self.__loop.call_soon_threadsafe(create_task)
+            return self.__loop.call_soon_threadsafe(self.__loop.create_task, coro)
 
     async def __setup_first_loop(self):
-        self.__current_users_mutex: asyncio.Lock = asyncio.Lock()
-        self.__users_connecting_mutex: asyncio.Lock = asyncio.Lock()
+        # we are running inside the loop here, so this is the thread the loop lives in
+        self.__loop_tid = get_ident()
 
     def start_server(self) -> None:
         logger.info("Starting websocket-server...")
@@ -91,66 +109,70 @@ class WebsocketServer(object):
             self.__internal_worker_join_thread.start()
         self._add_task_to_loop(self.__setup_first_loop())
         # the type-check here is sorta wrong, not entirely sure why
+        # permessage-deflate is not negotiated, the payloads (mostly images and protos) barely compress and
+        # inflating/deflating every frame would be done on the loop thread
         # noinspection PyTypeChecker
         self.__loop.run_until_complete(
             websockets.serve(self.__connection_handler, self.__args.ws_ip, int(self.__args.ws_port), max_size=2 ** 25,
-                             close_timeout=10))
-        self.__loop_tid = current_thread()
+                             close_timeout=10, compression=None, read_limit=2 ** 20, write_limit=2 ** 20))
         self.__loop.run_forever()
         logger.info("Websocket-server stopping...")
 
     async def __close_all_connections_and_signal_stop(self):
         logger.info("Signaling all workers to stop")
-        async with self.__current_users_mutex:
-            for worker_entry in self.__current_users.values():
-                worker_entry.worker_instance.stop_worker()
-                await self.__close_websocket_client_connection(worker_entry.origin,
-                                                               worker_entry.websocket_client_connection)
+        # take a copy, the dict may change while we are awaiting the connections to be closed
+        worker_entries: List[WebsocketConnectedClientEntry] = list(self.__current_users.values())
+        for worker_entry in worker_entries:
+            worker_entry.worker_instance.stop_worker()
+        # each close may take up to close_timeout, close all of them at once rather than one after another
+        await asyncio.gather(*(self.__close_websocket_client_connection(worker_entry.logger,
+                                                                        worker_entry.websocket_client_connection)
+                               for worker_entry in worker_entries),
+                             return_exceptions=True)
         logger.info("Done signalling all workers to stop")
 
     def stop_server(self) -> None:
         logger.info("Trying to stop websocket server")
         self.__stop_server.set()
-        # wait for connecting users to empty
-        while len(self.__users_connecting) > 0:
-            logger.info("Shutdown of websocket waiting for connecting devices")
-            time.sleep(1)
+        # wait for connecting users to be done
+        logger.info("Shutdown of websocket waiting for connecting devices")
+        asyncio.run_coroutine_threadsafe(self.__wait_for_connecting_origins(), self.__loop).result()
 
         future = asyncio.run_coroutine_threadsafe(
             self.__close_all_connections_and_signal_stop(),
             self.__loop)
         future.result()
         logger.info("Waiting for join-queue to be emptied and threads to be joined")
-        if not self.__internal_worker_join_thread.is_alive():
-            # join the join thread, gotta love the irony
+        if self.__internal_worker_join_thread.is_alive():
+            # join the join thread, gotta love the irony. It is done once the join-queue has been emptied
             self.__internal_worker_join_thread.join()
-        # TODO: this could block forever, should we just place a timeout and have daemon = True handle it all anyway?
-        self.__worker_shutdown_queue.join()
+        self.__worker_thread_pool.shutdown()
         self.__loop.call_soon_threadsafe(self.__loop.stop)
 
         logger.info("Stopped websocket server")
 
     def __internal_worker_join(self):
-        while not self.__stop_server.is_set() \
-                or (self.__stop_server.is_set() and not self.__worker_shutdown_queue.empty()):
-            try:
-                next_item: Optional[Thread] = self.__worker_shutdown_queue.get_nowait()
-            except queue.Empty:
-                time.sleep(1)
-                continue
-            if next_item is not None:
+        while not self.__stop_server.is_set() or self.__worker_shutdown_queue:
+            # wait for the event rather than polling the queue, wakes up right away once a thread is enqueued
+            self.__worker_shutdown_queued.wait(timeout=1)
+            # clear before emptying the queue, anything appended afterwards sets the event again
+            self.__worker_shutdown_queued.clear()
+            while self.__worker_shutdown_queue:
+                next_item: Tuple[PooledWorkerThread, asyncio.Event] = self.__worker_shutdown_queue.popleft()
+                worker_thread, stopped_event = next_item
                 logger.info("Trying to join worker thread")
                 try:
-                    next_item.join(10)
+                    worker_thread.join(10)
                 except RuntimeError as e:
                     logger.warning("Caught runtime error trying to join thread, the thread likely did not start at all."
                                    " Exact message: {}", e)
-                if next_item.is_alive():
+                if worker_thread.is_alive():
                     logger.debug("Error while joining worker thread - requeue it")
-                    self.__worker_shutdown_queue.put(next_item)
+                    self.__worker_shutdown_queue.append(next_item)
                 else:
                     logger.debug("Done with worker thread, moving on")
-            self.__worker_shutdown_queue.task_done()
+                    # wake up connection attempts of the origin waiting for this worker to be gone
+                    self.__loop.call_soon_threadsafe(stopped_event.set)
         logger.info("Worker join-thread done")
 
     @logger.catch()
@@ -164,37 +186,41 @@ class WebsocketServer(object):
         (origin, success) = await self.__authenticate_connection(websocket_client_connection)
         if success is False:
             # failed auth, stop connection
-            await self.__close_websocket_client_connection(origin, websocket_client_connection)
+            await self.__close_websocket_client_connection(_origin_logger(origin),
+                                                           websocket_client_connection)
             return
-        origin_logger = get_origin_logger(logger, origin=origin)
+        # reuse the logger bound to the origin if the device has been connected before
+        known_entry: Optional[WebsocketConnectedClientEntry] = self.__current_users.get(origin, None)
+        origin_logger = known_entry.logger if known_entry is not None else _origin_logger(origin)
 
         remote_address = websocket_client_connection.remote_address
 
         origin_logger.info("New connection from {}", remote_address)
         if self.__enable_configmode:
             origin_logger.warning('Connected in ConfigMode.  No mapping will occur in the current mode')
-        async with self.__users_connecting_mutex:
-            if origin in self.__users_connecting:
-                origin_logger.info("Done with connection ({}) -- Client is already connecting", remote_address)
+        # Connection attempts of the same origin are handled one after another, different origins do not block each
+        # other. __current_users itself is only ever modified from within the loop and thus needs no lock of its own
+        origin_lock = self.__get_origin_lock(origin)
+        if origin_lock.locked():
+            origin_logger.info("Client is already connecting, waiting for that attempt to finish ({})",
+                               remote_address)
+        old_worker_stopped: Optional[asyncio.Event] = None
+        async with origin_lock:
+            # the attempt may have been waiting for the lock while the server is being stopped
+            if self.__stop_server.is_set():
+                origin_logger.info("Server is stopping, not registering connection ({})", remote_address)
                 return
-            else:
-                self.__users_connecting.add(origin)
-
-        continue_register = True
-        async with self.__current_users_mutex:
+            continue_register = True
             origin_logger.debug("Checking if an entry is already present")
             entry = self.__current_users.get(origin, None)
-            device = None
             use_configmode = self.__enable_configmode
             if not self.__enable_configmode:
-                for _, dev in self.__data_manager.search('device', params={'origin': origin}).items():
-                    if dev['origin'] == origin:
-                        device = dev
-                        break
-                if not self.__data_manager.is_device_active(device.identifier):
+                # the devicemappings are keyed by origin and carry the device ID, no need to search the devices
+                if not self.__data_manager.is_device_active(self.__mapping_manager.get_device_id_of(origin)):
                     origin_logger.warning('Origin is currently paused. Unpause through MADmin to begin working')
                     use_configmode = True
-            if entry is None or use_configmode:
+            new_entry: bool = entry is None or use_configmode
+            if new_entry:
                 origin_logger.info("Need to start a new worker thread")
 
                 entry = WebsocketConnectedClientEntry(origin=origin,
@@ -206,11 +232,13 @@ class WebsocketServer(object):
                     continue_register = False
             else:
                 origin_logger.info("There is a worker thread entry present, handling accordingly")
+                # check the old worker's state once, the branches below are to agree on it
+                old_worker_alive: bool = entry.worker_thread.is_alive()
                 if entry.websocket_client_connection.open:
                     origin_logger.error("Old connection open while a new one is attempted to be established, "
                                         "aborting handling of connection")
                     continue_register = False
-                elif entry.worker_thread.is_alive() and not entry.worker_instance.is_stopping():
+                elif old_worker_alive and not entry.worker_instance.is_stopping():
                     # Ideally we just set the new connection in the entry and the worker starts using it.
                     # The problem is that the above check is racey. The worker could be stopping right
                     # now (because it shut itself down, etc). It's best to just disallow a new connection
@@ -218,40 +246,48 @@ class WebsocketServer(object):
                     origin_logger.info("Worker thread still alive, rejecting new conn ({}) because thread "
                                        "should be stopped when old connection is found dead", remote_address)
                     continue_register = False
-                elif not entry.worker_thread.is_alive():
+                    old_worker_stopped = entry.stopped_event
+                elif not old_worker_alive:
                     origin_logger.info("Old thread is dead, trying to start a new one ({})", remote_address)
                     if not await self.__add_worker_and_thread_to_entry(entry, origin, use_configmode=use_configmode):
                         continue_register = False
                 else:
                     origin_logger.info("Old thread is about to stop. Wait a little and reconnect ({})", remote_address)
-                    # random sleep to not have clients try again in sync
                     continue_register = False
+                    old_worker_stopped = entry.stopped_event
                 if continue_register:
                     entry.websocket_client_connection = websocket_client_connection
             if continue_register:
-                self.__current_users[origin] = entry
+                if new_entry:
+                    # an entry present already is updated in place
+                    self.__current_users[origin] = entry
+                self.__update_connected_origins()
+
+                if not entry.worker_thread.is_alive():
+                    origin_logger.debug('starting worker thread ({})', remote_address)
+                    entry.worker_thread.start()
 
         if not continue_register:
-            await asyncio.sleep(rand.uniform(3, 15))
-            async with self.__users_connecting_mutex:
-                origin_logger.debug("Removing from users_connecting")
-                self.__users_connecting.remove(origin)
+            # wait without holding the lock, neither further attempts of the origin nor the shutdown have to wait
+            if old_worker_stopped is not None:
+                # hold the connection until the old worker has been joined rather than sleeping a fixed time
+                try:
+                    await asyncio.wait_for(old_worker_stopped.wait(), timeout=15)
+                except asyncio.TimeoutError:
+                    origin_logger.info("Old worker did not stop in time ({})", remote_address)
+            else:
+                # random sleep to not have clients try again in sync
+                await asyncio.sleep(rand.uniform(3, 15))
             origin_logger.info("Done with connection ({}) (not allowing register)", remote_address)
             return
 
         worker_instance = entry.worker_instance
         worker_thread = entry.worker_thread
+        stopped_event = entry.stopped_event
         try:
-            if not worker_thread.is_alive():
-                origin_logger.debug('starting worker thread ({})', remote_address)
-                worker_thread.start()
             # TODO: we need to somehow check threads and synchronize connection status with worker status?
-            async with self.__users_connecting_mutex:
-                self.__users_connecting.remove(origin)
-            receiver_task = asyncio.ensure_future(
-                self.__client_message_receiver(origin, entry))
             origin_logger.debug('awaiting __client_message_receiver for connection {}', remote_address)
-            await receiver_task
+            await self.__client_message_receiver(origin, entry)
         except Exception as e:
             origin_logger.opt(exception=True).error("Other unhandled exception during registration: {}", e)
         # also check if thread is already running to not start it again. If it is not alive, we need to create it..
@@ -261,12 +297,28 @@ class WebsocketServer(object):
             if cur_connection == websocket_client_connection:
                 origin_logger.debug('stopping worker (connection {} done)', remote_address)
                 worker_instance.stop_worker()
-                self.__worker_shutdown_queue.put(worker_thread)
+                self.__worker_shutdown_queue.append((worker_thread, stopped_event))
+                self.__worker_shutdown_queued.set()
             else:
                 origin_logger.warning('Not stopping worker (connection {} done): we raced (connection {} active)',
                                       remote_address, cur_connection.remote_address)
+            self.__update_connected_origins()
         origin_logger.info("Done with connection ({})", remote_address)
 
+    def __get_origin_lock(self, origin: str) -> asyncio.Lock:
+        # only called from within the loop, no need to guard the creation
+        origin_lock: Optional[asyncio.Lock] = self.__origin_locks.get(origin, None)
+        if origin_lock is None:
+            origin_lock = asyncio.Lock()
+            self.__origin_locks[origin] = origin_lock
+        return origin_lock
+
+    async def __wait_for_connecting_origins(self) -> None:
+        # acquiring every lock once means each connection attempt that was going on has been dealt with
+        for origin_lock in list(self.__origin_locks.values()):
+            async with origin_lock:
+                pass
+
     async def __add_worker_and_thread_to_entry(self, entry, origin, use_configmode: bool = None) -> bool:
         communicator: AbstractCommunicator = Communicator(
             entry, origin, None, self.__args.websocket_command_timeout)
@@ -277,9 +329,8 @@ class WebsocketServer(object):
             return False
         # to break circular dependencies, we need to set the worker ref >.<
         communicator.worker_instance_ref = worker
-        new_worker_thread = Thread(name=origin, target=worker.start_worker)
-        new_worker_thread.daemon = True
-        entry.worker_thread = new_worker_thread
+        entry.worker_thread = self.__worker_thread_pool.create_thread(origin, worker.start_worker)
+        entry.stopped_event = asyncio.Event()
         entry.worker_instance = worker
         return True
 
@@ -289,20 +340,20 @@ class WebsocketServer(object):
         :param websocket_client_connection:
         :return: origin (string) if the auth and everything else checks out, else None to signal abort
         """
+        request_headers = websocket_client_connection.request_headers
         try:
-            origin = str(
-                websocket_client_connection.request_headers.get_all("Origin")[0])
+            origin = str(request_headers.get_all("Origin")[0])
         except IndexError:
             logger.warning("Client from {} tried to connect without Origin header",
                            websocket_client_connection.remote_address)
             return (None, False)
-        origin_logger = get_origin_logger(logger, origin=origin)
+        origin_logger = _origin_logger(origin)
         origin_logger.info("Client registering")
         if self.__mapping_manager is None:
             origin_logger.warning("No configuration has been defined.  Please define in MADmin and click "
                                   "'APPLY SETTINGS'")
-            (origin, False)
-        elif origin not in self.__mapping_manager.get_all_devicemappings().keys():
+            return (origin, False)
+        elif not self.__mapping_manager.has_devicemapping(origin):
             if(self.__data_manager.search('device', params={'origin': origin})):
                 origin_logger.warning("Device is created but not loaded.  Click 'APPLY SETTINGS' in MADmin to Update")
             else:
@@ -310,33 +361,32 @@ class WebsocketServer(object):
                                       " click 'APPLY SETTINGS'")
             return (origin, False)
 
-        valid_auths = self.__mapping_manager.get_auths()
-        auth_base64 = None
-        if valid_auths:
-            try:
-                auth_base64 = str(
-                    websocket_client_connection.request_headers.get_all("Authorization")[0])
-            except IndexError:
-                origin_logger.warning("Client tried to connect without auth header")
-                return (origin, False)
-        if valid_auths and auth_base64 and not check_auth(origin_logger, auth_base64, self.__args, valid_auths):
+        valid_auth_headers = self.__mapping_manager.get_auth_headers()
+        if not valid_auth_headers:
+            return (origin, True)
+        try:
+            auth_base64 = str(request_headers.get_all("Authorization")[0])
+        except IndexError:
+            origin_logger.warning("Client tried to connect without auth header")
             return (origin, False)
-        return (origin, True)
+        if auth_base64 in valid_auth_headers:
+            return (origin, True)
+        # no exact match, let check_auth have a closer look (and log why the auth failed)
+        return (origin, check_auth(origin_logger, auth_base64, self.__args, self.__mapping_manager.get_auths()))
 
     async def __client_message_receiver(self, origin: str, client_entry: WebsocketConnectedClientEntry) -> None:
         if client_entry is None:
             return
         connection: websockets.WebSocketClientProtocol = client_entry.websocket_client_connection
         remote_address = connection.remote_address
-        origin_logger = get_origin_logger(logger, origin=origin)
+        origin_logger = client_entry.logger
         origin_logger.info("Consumer handler starting ({})", remote_address)
 
         while connection.open:
             message = None
             try:
-                message = await asyncio.wait_for(connection.recv(), timeout=4.0)
-            except asyncio.TimeoutError:
-                await asyncio.sleep(0.02)
+                # no timeout needed, websockets pings the client (ping_interval) and closes dead connections itself
+                message = await connection.recv()
             except websockets.exceptions.ConnectionClosed as cc:
                 origin_logger.warning("Connection was closed ({}), stopping receiver. Exception: {}",
                                       remote_address, cc)
@@ -352,37 +402,46 @@ class WebsocketServer(object):
         response: Optional[MessageTyping] = None
         if isinstance(message, str):
             client_entry.logger.debug5("Receiving message: {}", message.strip())
-            splitup = message.split(";", 1)
-            message_id = int(splitup[0])
-            response = splitup[1]
+            separator = message.find(";")
+            if separator < 0:
+                client_entry.logger.warning("Dropping message without message ID: {}", message.strip())
+                return
+            message_id = int(message[:separator])
+            response = message[separator + 1:]
         else:
             logger.debug("Received binary values.")
-            message_id = int.from_bytes(message[:4], byteorder='big', signed=False)
+            if len(message) < MESSAGE_ID_STRUCT.size:
+                client_entry.logger.warning("Dropping binary message of {} bytes, too short for a message ID",
+                                            len(message))
+                return
+            # read the ID in place rather than slicing the first four bytes off into a new object
+            message_id = MESSAGE_ID_STRUCT.unpack_from(message)[0]
             response = message[4:]
         await client_entry.set_message_response(message_id, response)
 
     @staticmethod
-    async def __close_websocket_client_connection(origin_of_worker: str,
+    async def __close_websocket_client_connection(origin_logger,
                                                   websocket_client_connection: websockets.WebSocketClientProtocol) \
             -> None:
-        origin_logger = get_origin_logger(logger, origin=origin_of_worker)
         origin_logger.info('Closing connections')
         await websocket_client_connection.close()
         origin_logger.info("Connection closed")
 
     async def get_connected_origins(self) -> List[str]:
-        async with self.__current_users_mutex:
-            origins_connected: List[str] = []
-            for origin, entry in self.__current_users.items():
-                if entry.websocket_client_connection.open:
-                    origins_connected.append(origin)
-            return origins_connected
+        origins_connected: List[str] = []
+        for origin, entry in self.__current_users.items():
+            if entry.websocket_client_connection.open:
+                origins_connected.append(origin)
+        return origins_connected
+
+    def __update_connected_origins(self) -> None:
+        # only called from within the loop
+        self.__connected_origins = frozenset(origin for origin, entry in self.__current_users.items()
+                                             if entry.websocket_client_connection.open)
 
     def get_reg_origins(self) -> List[str]:
-        future = asyncio.run_coroutine_threadsafe(
-            self.get_connected_origins(),
-            self.__loop)
-        return future.result()
+        # reads the snapshot rather than waiting on the loop, use get_connected_origins for the exact state
+        return list(self.__connected_origins)
 
     def get_origin_communicator(self, origin: str) -> Optional[AbstractCommunicator]:
         # TODO: this should probably lock?
@@ -404,17 +463,15 @@ class WebsocketServer(object):
         self.__mapping_manager.set_devicesetting_value_of(origin, 'job', False)
 
     async def __close_and_signal_stop(self, origin: str) -> None:
-        origin_logger = get_origin_logger(logger, origin=origin)
+        entry: Optional[WebsocketConnectedClientEntry] = self.__current_users.get(origin, None)
+        origin_logger = entry.logger if entry is not None else _origin_logger(origin)
         origin_logger.info("Signaling to stop")
-        async with self.__current_users_mutex:
-            entry: Optional[WebsocketConnectedClientEntry] = self.__current_users.get(origin, None)
-            if entry is not None:
-                entry.worker_instance.stop_worker()
-                await self.__close_websocket_client_connection(entry.origin,
-                                                               entry.websocket_client_connection)
-                origin_logger.info("Done signaling stop")
-            else:
-                origin_logger.warning("Unable to signal to stop, not present")
+        if entry is not None:
+            entry.worker_instance.stop_worker()
+            await self.__close_websocket_client_connection(origin_logger, entry.websocket_client_connection)
+            origin_logger.info("Done signaling stop")
+        else:
+            origin_logger.warning("Unable to signal to stop, not present")
 
     def force_disconnect(self, origin) -> None:
         future = asyncio.run_coroutine_threadsafe(
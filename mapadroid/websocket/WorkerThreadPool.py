@@ -0,0 +1,111 @@
+from queue import SimpleQueue
+from threading import Event, Lock, Thread, current_thread
+from typing import Callable, List, Optional, Tuple
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.websocket)
+
+
+class PooledWorkerThread:
+    """
+    Runs a worker on a thread of the WorkerThreadPool while offering the parts of the Thread API the websocket
+    server relies on (start, is_alive, join)
+    """
+
+    def __init__(self, pool: "WorkerThreadPool", name: str, target: Callable[[], None]):
+        self.__pool: WorkerThreadPool = pool
+        self.name: str = name
+        self.__target: Callable[[], None] = target
+        self.__done: Optional[Event] = None
+
+    def start(self) -> None:
+        if self.__done is not None:
+            raise RuntimeError("threads can only be started once")
+        self.__done = self.__pool.run(self.name, self.__target)
+
+    def is_alive(self) -> bool:
+        return self.__done is not None and not self.__done.is_set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self.__done is None:
+            raise RuntimeError("cannot join thread before it is started")
+        # same as Thread.join, the caller is to check is_alive() after a timeout
+        self.__done.wait(timeout)
+
+
+class WorkerThreadPool:
+    """
+    Reuses threads for the workers of the websocket connections instead of spawning a new thread for each one.
+    Workers run as long as their connection, so once every thread of the pool is busy the worker gets a thread of
+    its own rather than waiting for another connection to end. All threads are daemons just like the threads
+    spawned per connection, a worker that does not stop does not keep MAD from exiting
+    """
+
+    def __init__(self, max_workers: int):
+        self.__max_workers: int = max(1, max_workers)
+        self.__jobs: SimpleQueue = SimpleQueue()
+        self.__threads: List[Thread] = []
+        self.__idle: int = 0
+        self.__mutex: Lock = Lock()
+
+    def create_thread(self, name: str, target: Callable[[], None]) -> PooledWorkerThread:
+        return PooledWorkerThread(self, name, target)
+
+    def run(self, name: str, target: Callable[[], None]) -> Event:
+        """ Runs target on a thread of the pool, returns the event set once target is done """
+        done = Event()
+        job = (name, target, done)
+        with self.__mutex:
+            if self.__idle > 0:
+                # one of the idle threads is going to pick up the job
+                self.__idle -= 1
+                self.__jobs.put(job)
+                return done
+            pool_saturated = len(self.__threads) >= self.__max_workers
+            if not pool_saturated:
+                thread = Thread(name='websocket_worker_%s' % (len(self.__threads),), target=self.__pool_thread)
+                thread.daemon = True
+                self.__threads.append(thread)
+                self.__jobs.put(job)
+                thread.start()
+                return done
+        logger.info("All {} threads of the worker pool are busy, starting a dedicated thread for {}",
+                    self.__max_workers, name)
+        thread = Thread(name=name, target=self.__run_job, args=job)
+        thread.daemon = True
+        thread.start()
+        return done
+
+    def shutdown(self) -> None:
+        with self.__mutex:
+            # the idle threads exit right away, busy ones once their worker is done
+            for _ in self.__threads:
+                self.__jobs.put(None)
+            self.__threads.clear()
+            self.__idle = 0
+
+    def __pool_thread(self) -> None:
+        while True:
+            job: Optional[Tuple[str, Callable[[], None], Event]] = self.__jobs.get()
+            if job is None:
+                return
+            # the workers (and their logs) know the thread by the origin it is working for
+            thread = current_thread()
+            pool_thread_name = thread.name
+            thread.name = job[0]
+            try:
+                self.__run_job(*job)
+            finally:
+                thread.name = pool_thread_name
+            with self.__mutex:
+                self.__idle += 1
+
+    @staticmethod
+    def __run_job(name: str, target: Callable[[], None], done: Event) -> None:
+        try:
+            target()
+        except Exception as e:
+            logger.opt(exception=True).error("Worker {} stopped with an unhandled exception: {}", name, e)
+        finally:
+            done.set()
@@ -13,6 +13,8 @@ import pkg_resources
 import psutil
 
 from mapadroid.data_manager import DataManager
+from mapadroid.data_manager.modules.routecalc import \
+    shutdown_route_calculations
 from mapadroid.db.DbFactory import DbFactory
 from mapadroid.mad_apk import (AbstractAPKStorage, StorageSyncManager,
                                get_storage_obj)
@@ -373,6 +375,10 @@ if __name__ == "__main__":
                 ws_server.stop_server()
                 logger.info("Waiting for websocket-thread to exit")
                 t_ws.join()
+            # route recalculations triggered through MADmin run in this process
+            shutdown_route_calculations()
+            if mapping_manager is not None:
+                mapping_manager.shutdown()
             if mapping_manager_manager is not None:
                 mapping_manager_manager.shutdown()
             if mitm_mapper_manager is not None:
@@ -0,0 +1,222 @@
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Thread
+from unittest.mock import call
+
+import numpy as np
+import pytest
+
+from mapadroid.data_manager.modules import RouteCalc, routecalc
+from mapadroid.route.routecalc import calculate_route_all
+
+COORDS = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+
+
+def sleeping_route_calc_all(coords, route_name, num_processes, algorithm, in_memory=False):
+    time.sleep(30)
+    return list(range(len(coords)))
+
+
+class FakePool:
+    """ Runs the submitted calls synchronously or fails like a pool with a dead process """
+
+    def __init__(self, broken: bool = False):
+        self.broken = broken
+        self.shutdown_called = False
+
+    def submit(self, func, *args):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool())
+        else:
+            future.set_result(func(*args))
+        return future
+
+    def shutdown(self, wait=True):
+        self.shutdown_called = True
+
+
+@pytest.fixture
+def route_calc_all(monkeypatch):
+    calls = []
+
+    def fake_route_calc_all(coords, route_name, num_processes, algorithm, in_memory=False):
+        calls.append(route_name)
+        return list(reversed(range(len(coords))))
+
+    monkeypatch.setattr(calculate_route_all, "route_calc_all", fake_route_calc_all)
+    monkeypatch.setattr(routecalc, "_route_calc_pool", None)
+    monkeypatch.setattr(routecalc, "_route_calc_pool_shut_down", False)
+    monkeypatch.setattr(routecalc, "_route_calc_futures", set())
+    return calls
+
+
+def use_pools(monkeypatch, pools):
+    created = iter(pools)
+    monkeypatch.setattr(routecalc, "ProcessPoolExecutor", lambda: next(created))
+
+
+def test_calculate_route(monkeypatch, route_calc_all):
+    pool = FakePool()
+    use_pools(monkeypatch, [pool])
+    assert routecalc._calculate_route(COORDS, "test", 1, "route") == [2, 1, 0]
+    assert routecalc._calculate_route(COORDS, "test", 1, "route") == [2, 1, 0]
+    # the pool is reused
+    assert routecalc._route_calc_pool is pool
+
+
+def test_calculate_route_broken_pool(monkeypatch, route_calc_all):
+    broken_pool = FakePool(broken=True)
+    pool = FakePool()
+    use_pools(monkeypatch, [broken_pool, pool])
+    assert routecalc._calculate_route(COORDS, "test", 1, "route") == [2, 1, 0]
+    assert broken_pool.shutdown_called
+    assert routecalc._route_calc_pool is pool
+
+
+def test_calculate_route_in_process(monkeypatch, route_calc_all):
+    use_pools(monkeypatch, [FakePool(broken=True), FakePool(broken=True)])
+    assert routecalc._calculate_route(COORDS, "test", 1, "route") == [2, 1, 0]
+    assert route_calc_all == ["test"]
+    assert routecalc._route_calc_pool is None
+
+
+def test_calculate_route_in_memory(monkeypatch, route_calc_all):
+    # in memory calculations never wait for the pool
+    use_pools(monkeypatch, [])
+    assert routecalc._calculate_route(COORDS, "test", 1, "route", in_memory=True) == [2, 1, 0]
+    assert route_calc_all == ["test"]
+    assert routecalc._route_calc_pool is None
+
+
+def test_shutdown_route_calculations(monkeypatch, route_calc_all):
+    monkeypatch.setattr(calculate_route_all, "route_calc_all", sleeping_route_calc_all)
+    # a single process, so that most of the calculations are queued
+    monkeypatch.setattr(routecalc, "ProcessPoolExecutor", lambda: ProcessPoolExecutor(max_workers=1))
+    errors = []
+
+    def calculate():
+        try:
+            routecalc._calculate_route(COORDS, "test", 1, "route")
+        except Exception as e:
+            errors.append(e)
+
+    calculations = [Thread(target=calculate, daemon=True) for _ in range(4)]
+    for calculation in calculations:
+        calculation.start()
+    time.sleep(1)
+    start = time.monotonic()
+    routecalc.shutdown_route_calculations()
+    for calculation in calculations:
+        calculation.join(10)
+    assert time.monotonic() - start < 10
+    assert len(errors) == 4
+    assert all(isinstance(error, (BrokenProcessPool, CancelledError)) for error in errors)
+    with pytest.raises(RuntimeError):
+        routecalc._calculate_route(COORDS, "test", 1, "route")
+
+
+def test_shutdown_route_calculations_without_pool(monkeypatch, route_calc_all):
+    use_pools(monkeypatch, [])
+    routecalc.shutdown_route_calculations()
+    with pytest.raises(RuntimeError):
+        routecalc._calculate_route(COORDS, "test", 1, "route")
+
+
+def test_calculate_new_route(data_manager, monkeypatch, route_calc_all):
+    use_pools(monkeypatch, [FakePool()])
+    route = RouteCalc(data_manager)
+    new_route = route.calculate_new_route(COORDS, 0, 0, False, "route", False, 15, in_memory=True)
+    assert new_route == [{'lat': 5.0, 'lng': 6.0}, {'lat': 3.0, 'lng': 4.0}, {'lat': 1.0, 'lng': 2.0}]
+    new_route = route.calculate_new_route(COORDS, 0, 0, False, "route", False, 15, in_memory=True,
+                                          return_format='ndarray')
+    assert new_route.tolist() == [[5.0, 6.0], [3.0, 4.0], [1.0, 2.0]]
+
+
+def test_calculate_new_route_failed(data_manager, monkeypatch):
+    def failing_calculation(*args, **kwargs):
+        raise BrokenProcessPool()
+
+    monkeypatch.setattr(routecalc, "_calculate_route", failing_calculation)
+    route = RouteCalc(data_manager)
+    route.identifier = 1
+    with pytest.raises(BrokenProcessPool):
+        route.calculate_new_route(COORDS, 0, 0, False, "route", False, 15, in_memory=True)
+    assert data_manager.dbc.mock_calls[-1] == call.autoexec_update('settings_routecalc', {'recalc_status': 0},
+                                                                   where_keyvals={'routecalc_id': 1})
+
+
+@pytest.fixture
+def routefile_cache(monkeypatch):
+    monkeypatch.setattr(routecalc, "_parsed_routefiles", {})
+
+
+@pytest.mark.usefixtures("routefile_cache")
+def test_parse_routefile():
+    parsed = routecalc._parse_routefile(("1.5,2.5", "", "-3,4.25 ", " 5e-1, 6"))
+    assert parsed.tolist() == [[1.5, 2.5], [-3.0, 4.25], [0.5, 6.0]]
+    assert parsed.dtype == np.float64
+    assert routecalc._parse_routefile(()).shape == (0, 2)
+
+
+@pytest.mark.usefixtures("routefile_cache")
+def test_parse_routefile_cache():
+    routefile = ("1.5,2.5", "3,4")
+    parsed = routecalc._parse_routefile(routefile)
+    assert routecalc._parse_routefile(tuple(routefile)) is parsed
+    # shared between callers and thus not to be modified in place
+    with pytest.raises(ValueError):
+        parsed[0, 0] = 0
+    # any change of the routefile is a miss
+    assert routecalc._parse_routefile(("1.5,2.5", "3,5")).tolist() == [[1.5, 2.5], [3.0, 5.0]]
+
+
+@pytest.mark.usefixtures("routefile_cache")
+def test_parse_routefile_cache_size(monkeypatch):
+    monkeypatch.setattr(routecalc, "ROUTEFILE_CACHE_SIZE", 2)
+    first = routecalc._parse_routefile(("1,1",))
+    routecalc._parse_routefile(("2,2",))
+    # a hit makes the routefile the most recently used one
+    assert routecalc._parse_routefile(("1,1",)) is first
+    routecalc._parse_routefile(("3,3",))
+    assert list(routecalc._parsed_routefiles.keys()) == [("1,1",), ("3,3",)]
+
+
+@pytest.mark.usefixtures("routefile_cache")
+@pytest.mark.parametrize("routefile", [
+    ("1,2", "3,abc"),
+    ("1,2,3", "4"),
+    ("1,2", "3"),
+    ("1;2",),
+])
+def test_parse_routefile_malformed(routefile):
+    # the fast path must not silently produce coords out of malformed lines, the fallback raises on them
+    with pytest.raises((ValueError, IndexError)):
+        routecalc._parse_routefile(routefile)
+    assert routefile not in routecalc._parsed_routefiles
+
+
+@pytest.mark.usefixtures("routefile_cache")
+def test_get_saved_json_route(data_manager):
+    route = RouteCalc(data_manager)
+    route["routefile"] = ["1.5,2.5", "3,4"]
+    saved_route = route.get_saved_json_route()
+    assert saved_route == [{'lat': 1.5, 'lng': 2.5}, {'lat': 3.0, 'lng': 4.0}]
+    # every caller gets dicts of its own
+    saved_route[0]['lat'] = 0
+    assert route.get_saved_json_route() == [{'lat': 1.5, 'lng': 2.5}, {'lat': 3.0, 'lng': 4.0}]
+    assert route.get_json_route(COORDS, 0, 0, False, return_format='ndarray').tolist() == [[1.5, 2.5], [3.0, 4.0]]
+
+
+@pytest.mark.usefixtures("routefile_cache")
+def test_get_json_route_seeds_cache(data_manager, monkeypatch, route_calc_all):
+    use_pools(monkeypatch, [FakePool()])
+    route = RouteCalc(data_manager)
+    new_route = route.get_json_route(COORDS, 0, 0, False, return_format='ndarray')
+    assert route["routefile"] == ["5.0,6.0", "3.0,4.0", "1.0,2.0"]
+    # the array handed out stays writable, the cache holds a read-only copy of its own
+    new_route[0, 0] = 0
+    cached = routecalc._parsed_routefiles[tuple(route["routefile"])]
+    assert cached.tolist() == [[5.0, 6.0], [3.0, 4.0], [1.0, 2.0]]
+    assert not cached.flags.writeable
@@ -0,0 +1,28 @@
+import time
+
+import numpy as np
+import pytest
+
+from mapadroid.route.routecalc import calculate_route_all
+
+COORDS = np.random.default_rng(1).uniform(low=(50.0, 8.0), high=(50.05, 8.05), size=(25, 2))
+
+
+def assert_visits_all(route):
+    assert sorted(route) == list(range(len(COORDS)))
+
+
+@pytest.mark.parametrize("algorithm", ["quick", "route"])
+def test_route_calc_all(algorithm, monkeypatch):
+    monkeypatch.setattr(calculate_route_all, "ORTOOLS_TIME_LIMIT_SECONDS", 1)
+    assert_visits_all(calculate_route_all.route_calc_all(COORDS, "test", 1, algorithm))
+
+
+def test_route_calc_ortools_in_memory(monkeypatch):
+    pytest.importorskip("ortools")
+    monkeypatch.setattr(calculate_route_all, "ORTOOLS_TIME_LIMIT_SECONDS", 10)
+    start = time.monotonic()
+    route = calculate_route_all.route_calc_all(COORDS, "test", 1, "route", in_memory=True)
+    # in memory routes are not improved upon until the time limit
+    assert time.monotonic() - start < 5
+    assert_visits_all(route)
@@ -0,0 +1,67 @@
+import tracemalloc
+
+import numpy as np
+
+from mapadroid.route.routecalc import \
+    ClusteringHelper as clustering_helper_module
+from mapadroid.route.routecalc.ClusteringHelper import ClusteringHelper
+from mapadroid.utils.collections import Location
+from mapadroid.utils.geo import get_distance_of_two_points_in_meters
+
+MAX_RADIUS = 70
+MAX_TIMEDELTA_SECONDS = 600
+
+
+def get_events(amount, span=0.02, seed=1):
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(low=(50.0, 8.0), high=(50.0 + span, 8.0 + span), size=(amount, 2)).tolist()
+    timestamps = rng.integers(0, 1200, size=amount).tolist()
+    events = [(timestamp, Location(lat, lng)) for timestamp, (lat, lng) in zip(timestamps, coords)]
+    # an event of the same coords is only related once
+    events.append((timestamps[0] + 1, events[0][1]))
+    return events
+
+
+def get_expected_relations(queue, max_radius, max_timedelta_seconds):
+    relations = {}
+    for event in queue:
+        relations.setdefault(event, [])
+        for other_event in queue:
+            distance = get_distance_of_two_points_in_meters(event[1].lat, event[1].lng,
+                                                            other_event[1].lat, other_event[1].lng)
+            timedelta = event[0] - other_event[0]
+            if distance <= max_radius * 2 and 0 <= timedelta <= max_timedelta_seconds and \
+               other_event[1] not in [relation[0][1] for relation in relations[event]]:
+                relations[event].append((other_event, distance, timedelta))
+    return relations
+
+
+def test_get_relations_in_range_within_time(monkeypatch):
+    # several chunks, the last one incomplete
+    monkeypatch.setattr(clustering_helper_module, "DISTANCE_ROWS_PER_CHUNK", 16)
+    events = get_events(100)
+    helper = ClusteringHelper(MAX_RADIUS, 5, MAX_TIMEDELTA_SECONDS)
+    relations = helper._get_relations_in_range_within_time(events, MAX_RADIUS)
+    expected = get_expected_relations(events, MAX_RADIUS, MAX_TIMEDELTA_SECONDS)
+    assert list(relations.keys()) == list(expected.keys())
+    for event, event_relations in relations.items():
+        assert [relation.other_event for relation in event_relations] == \
+            [other_event for other_event, _, _ in expected[event]]
+        assert [relation.timedelta for relation in event_relations] == \
+            [timedelta for _, _, timedelta in expected[event]]
+        assert np.allclose([relation.distance for relation in event_relations],
+                           [distance for _, distance, _ in expected[event]])
+
+
+def test_get_relations_in_range_within_time_large_queue():
+    # spawnpoints of a large area, the full matrix of float64 distances alone would take 200 MB
+    events = get_events(5000, span=0.2)
+    helper = ClusteringHelper(MAX_RADIUS, 5, MAX_TIMEDELTA_SECONDS)
+    tracemalloc.start()
+    try:
+        relations = helper._get_relations_in_range_within_time(events, MAX_RADIUS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(relations) == len(events)
+    assert peak < 50 * 1024 * 1024
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from mapadroid.utils import geo
+
+COORDS = [(52.5200, 13.4050), (48.8566, 2.3522), (51.5074, -0.1278), (52.5201, 13.4051)]
+
+
+@pytest.mark.parametrize("implementation", [
+    geo.get_distance_matrix_in_meters,
+    geo._distance_matrix_in_meters_numpy,
+    geo._distance_matrix_in_meters_kernel,
+])
+def test_distance_matrix_in_meters(implementation):
+    lats = np.array([lat for lat, _ in COORDS], dtype=np.float64)
+    lngs = np.array([lng for _, lng in COORDS], dtype=np.float64)
+    distances = implementation(lats, lngs)
+    assert distances.shape == (len(COORDS), len(COORDS))
+    for i, (start_lat, start_lng) in enumerate(COORDS):
+        for j, (dest_lat, dest_lng) in enumerate(COORDS):
+            expected = geo.get_distance_of_two_points_in_meters(start_lat, start_lng, dest_lat, dest_lng)
+            assert distances[i, j] == pytest.approx(expected, abs=1e-6)
+
+
+def test_distances_in_meters():
+    lats = np.array([lat for lat, _ in COORDS], dtype=np.float64)
+    lngs = np.array([lng for _, lng in COORDS], dtype=np.float64)
+    # rows of the distance matrix
+    distances = geo.get_distances_in_meters(lats[1:3], lngs[1:3], lats, lngs)
+    assert distances.shape == (2, len(COORDS))
+    assert np.allclose(distances, geo._distance_matrix_in_meters_numpy(lats, lngs)[1:3])
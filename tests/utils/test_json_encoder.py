@@ -0,0 +1,92 @@
+import json
+from collections import OrderedDict, defaultdict, namedtuple
+
+import numpy as np
+import pytest
+
+from mapadroid.data_manager.modules.auth import Auth
+from mapadroid.mad_apk.apk_enums import APKArch, APKType
+from mapadroid.mad_apk.custom_types import MADapks, MADPackage, MADPackages
+from mapadroid.utils import json_encoder
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if json_encoder.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_encoder, "orjson", None)
+    return json_encoder
+
+
+def get_apks() -> MADapks:
+    package = MADPackage(APKType.pogo, APKArch.arm64_v8a, version="0.123.1", size=1234)
+    packages = MADPackages()
+    packages[APKArch.arm64_v8a] = package
+    apks = MADapks()
+    apks[APKType.pogo] = packages
+    return apks
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_dict_subclasses(encoder, indent):
+    counts = defaultdict(int)
+    counts["total"] += 1
+    payload = {
+        "results": OrderedDict([("b", 1), ("a", 2)]),
+        "counts": counts,
+    }
+    dumped = encoder.dumps(payload, indent=indent)
+    assert json.loads(dumped) == {"results": {"b": 1, "a": 2}, "counts": {"total": 1}}
+    # OrderedDict keeps its order
+    assert dumped.index('"b"') < dumped.index('"a"')
+
+
+def test_other_subclasses(encoder):
+    point = namedtuple("Point", ["lat", "lng"])
+    assert json.loads(encoder.dumps({"point": point(1.5, 2.5)})) == {"point": [1.5, 2.5]}
+    assert encoder.dumps(np.float64(1.5)) == "1.5"
+    assert json.loads(encoder.dumps({"distance": np.float64(1.5)}, indent=2)) == {"distance": 1.5}
+
+
+def test_large_integers(encoder):
+    # beyond the 64 bits orjson supports
+    assert json.loads(encoder.dumps({"id": 2 ** 70, "other": 1})) == {"id": 2 ** 70, "other": 1}
+    assert json.loads(encoder.dumps([-2 ** 64], indent=2)) == [-2 ** 64]
+
+
+def test_mad_apks(encoder):
+    expected = {
+        "pogo": {
+            "arm64_v8a": {
+                "arch_disp": "arm64_v8a",
+                "file_id": None,
+                "filename": None,
+                "mimetype": None,
+                "size": 1234,
+                "usage_disp": "pogo",
+                "version": "0.123.1"
+            }
+        }
+    }
+    assert json.loads(encoder.dumps(get_apks())) == expected
+    assert json.loads(encoder.dumps(get_apks(), indent=2)) == expected
+
+
+def test_enum(encoder):
+    assert json.loads(encoder.dumps({"arch": APKArch.arm64_v8a})) == {"arch": APKArch.arm64_v8a.value}
+
+
+def test_resource(encoder, data_manager):
+    resource = Auth(data_manager)
+    resource["username"] = "test"
+    resource["password"] = "pass"
+    assert json.loads(encoder.dumps(resource)) == {"username": "test", "password": "pass"}
+    # resources are keyed by their identifiers within the API
+    assert json.loads(encoder.dumps({1: resource})) == {"1": {"username": "test", "password": "pass"}}
+
+
+def test_unknown_type(encoder):
+    with pytest.raises(TypeError):
+        encoder.dumps({"unknown": object()})
@@ -0,0 +1,34 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from mapadroid.websocket.WebsocketServer import WebsocketServer
+
+on_message = WebsocketServer._WebsocketServer__on_message
+
+
+class FakeEntry:
+    def __init__(self):
+        self.logger = MagicMock()
+        self.responses = []
+
+    async def set_message_response(self, message_id, message):
+        self.responses.append((message_id, message))
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("12;OK", [(12, "OK")]),
+    ("7;screen;size", [(7, "screen;size")]),
+    ("3;", [(3, "")]),
+    ((5).to_bytes(4, byteorder='big') + b"\x00\x01", [(5, b"\x00\x01")]),
+    ((2 ** 32 - 1).to_bytes(4, byteorder='big'), [(2 ** 32 - 1, b"")]),
+    # frames without a message ID are dropped
+    ("OK", []),
+    (b"\x00\x01", []),
+])
+def test_on_message(message, expected):
+    entry = FakeEntry()
+    asyncio.run(on_message(entry, message))
+    assert entry.responses == expected
+    assert entry.logger.warning.called == (not expected)
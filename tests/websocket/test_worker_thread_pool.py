@@ -0,0 +1,103 @@
+import logging
+from threading import Event, current_thread
+
+import pytest
+
+from mapadroid.websocket.WorkerThreadPool import WorkerThreadPool
+
+TIMEOUT = 5
+
+
+class BlockingWorker:
+    def __init__(self):
+        self.started = Event()
+        self.release = Event()
+        self.thread = None
+
+    def start_worker(self):
+        self.thread = current_thread()
+        self.started.set()
+        self.release.wait(TIMEOUT)
+
+
+@pytest.fixture
+def pool():
+    worker_pool = WorkerThreadPool(1)
+    yield worker_pool
+    worker_pool.shutdown()
+
+
+def start(pool, name):
+    worker = BlockingWorker()
+    thread = pool.create_thread(name, worker.start_worker)
+    thread.start()
+    assert worker.started.wait(TIMEOUT)
+    return worker, thread
+
+
+def test_is_alive_and_join(pool):
+    worker, thread = start(pool, "origin")
+    assert thread.is_alive()
+    # the worker is named after the origin and is a daemon like the threads spawned per connection
+    assert worker.thread.name == "origin"
+    assert worker.thread.daemon
+    thread.join(0.01)
+    assert thread.is_alive()
+    worker.release.set()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive()
+
+
+def test_thread_reused(pool):
+    first_worker, first_thread = start(pool, "first")
+    first_worker.release.set()
+    first_thread.join(TIMEOUT)
+    second_worker, second_thread = start(pool, "second")
+    assert second_worker.thread is first_worker.thread
+    second_worker.release.set()
+    second_thread.join(TIMEOUT)
+    assert not second_thread.is_alive()
+
+
+def test_saturated(pool):
+    pooled_worker, pooled_thread = start(pool, "pooled")
+    # the only thread of the pool is busy, the next worker must not have to wait for it
+    dedicated_worker, dedicated_thread = start(pool, "dedicated")
+    assert dedicated_worker.thread is not pooled_worker.thread
+    assert dedicated_worker.thread.name == "dedicated"
+    assert dedicated_worker.thread.daemon
+    assert pooled_thread.is_alive() and dedicated_thread.is_alive()
+    dedicated_worker.release.set()
+    dedicated_thread.join(TIMEOUT)
+    assert not dedicated_thread.is_alive()
+    assert pooled_thread.is_alive()
+    pooled_worker.release.set()
+    pooled_thread.join(TIMEOUT)
+    assert not pooled_thread.is_alive()
+
+
+def test_exception_logged(pool, caplog):
+    def failing_worker():
+        raise ValueError("worker failed")
+
+    thread = pool.create_thread("origin", failing_worker)
+    with caplog.at_level(logging.ERROR):
+        thread.start()
+        thread.join(TIMEOUT)
+    assert not thread.is_alive()
+    assert "Worker origin stopped with an unhandled exception: worker failed" in caplog.text
+    # the thread of the pool survives the failed worker
+    worker, thread = start(pool, "next")
+    worker.release.set()
+    thread.join(TIMEOUT)
+
+
+def test_start_and_join_once(pool):
+    thread = pool.create_thread("origin", lambda: None)
+    with pytest.raises(RuntimeError):
+        thread.join()
+    assert not thread.is_alive()
+    thread.start()
+    thread.join(TIMEOUT)
+    with pytest.raises(RuntimeError):
+        thread.start()